@@ -1,23 +1,102 @@
+import asyncio
 import os
-from typing import Any, Dict, List, Optional
-from neo4j import GraphDatabase  # removed RoutingControl
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+from cachetools import LRUCache, TTLCache
+from neo4j import READ_ACCESS, AsyncGraphDatabase, AsyncManagedTransaction, Driver, GraphDatabase  # removed RoutingControl
+from neo4j.exceptions import Neo4jError
+from neo4j.graph import Node, Relationship
 from marisa_trie import Trie  # optional
 
+
+# Process-wide drivers shared by all KGConnector instances, keyed by connection settings.
+# Each driver owns a connection pool, so reusing it amortizes TCP/TLS/bolt handshakes.
+_DRIVER_CACHE: Dict[tuple, Driver] = {}
+_DRIVER_CACHE_LOCK = threading.Lock()
+
+_DEFAULT_DRIVER_KWARGS = {
+    "max_connection_pool_size": 100,
+    "connection_acquisition_timeout": 60,
+}
+
+
+def _freeze(value: Any) -> Any:
+    """Hashable form of a driver option value (lists, sets and dicts are common, e.g. notification filters)."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return frozenset((k, _freeze(v)) for k, v in value.items())
+    return value
+
+
+def _driver_cache_key(uri: str, username: str, password: str, database: str,
+                      driver_kwargs: Dict[str, Any]) -> Optional[tuple]:
+    """Key of the shared driver for these settings, or None if an option cannot be hashed."""
+    try:
+        key = (uri, username, password, database, frozenset((k, _freeze(v)) for k, v in driver_kwargs.items()))
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+# Schema used by name/id lookups; every statement must be idempotent.
+_SCHEMA_DDL = (
+    "CREATE INDEX entity_name IF NOT EXISTS FOR (n:Entity) ON (n.name)",
+    "CREATE CONSTRAINT entity_id IF NOT EXISTS FOR (n:Entity) REQUIRE n.id IS UNIQUE",
+)
+
+_ENTITY_CONNECTIONS_CYPHER = """
+UNWIND $inputs AS input
+MATCH (n:Entity)
+WHERE elementId(n) = input OR n.name = input
+OPTIONAL MATCH (n)-[r]-(m:Entity)
+RETURN input,
+       n AS current_node,
+       collect(DISTINCT m) AS direct_node,
+       collect({relation_name: type(r), start: elementId(startNode(r)), end: elementId(endNode(r))}) AS relations
+"""
+
+
+def _parse_connection_row(row) -> Dict[str, Any]:
+    """Convert one row of `_ENTITY_CONNECTIONS_CYPHER` into the `get_entity_connections` dict format."""
+    cur = row["current_node"]
+    current_node = {"identity": cur.element_id, "labels": list(cur.labels), "properties": dict(cur)}
+    direct_nodes = [{"identity": m.element_id, "labels": list(m.labels), "properties": dict(m)} for m in row["direct_node"]]
+    # OPTIONAL MATCH yields a single all-null relation for entities without relationships
+    relations = [
+        {"relation_name": r["relation_name"], "start": r["start"], "end": r["end"]}
+        for r in row["relations"] if r["relation_name"] is not None
+    ]
+    return {"current_node": current_node, "direct_node": direct_nodes, "relations": relations}
+
+
 class KGConnector:
     """
     Neo4j connector helper with entity relationship retrieval.
 
     Notes:
     - Uses `elementId(...)` instead of deprecated `id(...)` in Cypher.
-    - Driver is created lazily; calling methods after `close()` raises an error.
+    - Driver is created lazily and shared by every instance with the same connection settings;
+      `close()` only detaches this instance, use `KGConnector.shutdown_all()` to close the drivers.
+      An instance whose driver options cannot be hashed gets its own driver, closed by `close()`.
+    - Calling methods after `close()` raises an error.
+    - The `:Entity(name)` index and `:Entity(id)` constraint are created on first use (see `ensure_indexes`).
     """
 
+    # (uri, database) pairs whose schema was already ensured in this process
+    _indexes_ensured: Set[Tuple[str, str]] = set()
+    _indexes_lock = threading.Lock()
+
     def __init__(
         self,
         uri: Optional[str] = None,
         username: Optional[str] = None,
         password: Optional[str] = None,
         database: Optional[str] = None,
+        cache_size: int = 100_000,
+        cache_ttl: Optional[float] = None,
         **driver_kwargs: Any,
     ):
         self.uri = uri or os.getenv("KG_URI")
@@ -29,23 +108,87 @@ class KGConnector:
 
         self._driver = None  # create lazily
         self._driver_kwargs = driver_kwargs
+        self._owns_driver = False  # True for a private (not shared) driver, see `_ensure_driver`
         self._closed = False
 
+        # per-instance cache of entity lookups (input string -> connections, {} when not found)
+        self._cache = TTLCache(maxsize=cache_size, ttl=cache_ttl) if cache_ttl else LRUCache(maxsize=cache_size)
+        self._cache_lock = threading.Lock()
+
     def _ensure_driver(self):
         if self._closed:
             raise RuntimeError("KGConnector driver has been closed; create a new KGConnector instance.")
         if self._driver is None:
-            # create driver on first use
-            self._driver = GraphDatabase.driver(self.uri, auth=(self.username, self.password), **self._driver_kwargs)
+            # create (or reuse) the shared driver on first use
+            key = _driver_cache_key(self.uri, self.username, self.password, self.database, self._driver_kwargs)
+            kwargs = {**_DEFAULT_DRIVER_KWARGS, **self._driver_kwargs}
+            if key is None:
+                # unhashable option value: this instance gets its own driver, closed by `close()`
+                driver = GraphDatabase.driver(self.uri, auth=(self.username, self.password), **kwargs)
+            else:
+                with _DRIVER_CACHE_LOCK:
+                    driver = _DRIVER_CACHE.get(key)
+                    if driver is None:
+                        driver = GraphDatabase.driver(self.uri, auth=(self.username, self.password), **kwargs)
+                        _DRIVER_CACHE[key] = driver
+            # the driver is only published once the schema is ensured, so a failure
+            # (e.g. ServiceUnavailable) is retried on the next call
+            try:
+                self._ensure_schema(driver)
+            except BaseException:
+                if key is None:
+                    driver.close()
+                raise
+            self._driver = driver
+            self._owns_driver = key is None
+
+    def ensure_indexes(self) -> None:
+        """
+        Create the index on `:Entity(name)` and the uniqueness constraint on `:Entity(id)` if missing,
+        so name/id lookups use an index seek instead of a label scan.
+        The DDL is idempotent and only issued once per process for each uri/database.
+        """
+        if self._driver is None:
+            self._ensure_driver()  # ensures the schema before publishing the driver
+        else:
+            self._ensure_schema(self._driver)
+
+    def _ensure_schema(self, driver: Driver) -> None:
+        key = (self.uri, self.database)
+        # held while the DDL runs, so concurrent threads issue it only once
+        with KGConnector._indexes_lock:
+            if key in KGConnector._indexes_ensured:
+                return
+            with driver.session(database=self.database) as session:
+                for ddl in _SCHEMA_DDL:
+                    try:
+                        session.run(ddl).consume()
+                    except Neo4jError as e:
+                        # e.g. read-only user or duplicated ids: lookups still work, only slower
+                        print(f"Skipping schema statement ({e.code}): {ddl}")
+            KGConnector._indexes_ensured.add(key)
 
     def close(self) -> None:
-        if self._driver is not None:
-            try:
-                self._driver.close()
-            finally:
-                self._driver = None
+        # a shared driver is used by other instances, so only detach from it
+        if self._owns_driver and self._driver is not None:
+            self._driver.close()
+        self._driver = None
         self._closed = True
 
+    def clear_cache(self) -> None:
+        """Drop all cached entity lookups of this instance."""
+        with self._cache_lock:
+            self._cache.clear()
+
+    @staticmethod
+    def shutdown_all() -> None:
+        """Close every shared driver (e.g. at process exit). New instances will create fresh drivers."""
+        with _DRIVER_CACHE_LOCK:
+            drivers = list(_DRIVER_CACHE.values())
+            _DRIVER_CACHE.clear()
+        for driver in drivers:
+            driver.close()
+
     def __enter__(self) -> "KGConnector":
         # do not create driver until needed
         return self
@@ -61,9 +204,7 @@ class KGConnector:
 
     def count_nodes(self) -> int:
         def _q(tx):
-            res = tx.run("MATCH (n) RETURN count(n) AS total_nodes")
-            row = res.single()
-            return int(row["total_nodes"]) if row and row["total_nodes"] is not None else 0
+            return tx.run("MATCH (n) RETURN count(n)").single().value() or 0
 
         self._ensure_driver()
         with self._driver.session(database=self.database) as session:
@@ -79,46 +220,47 @@ class KGConnector:
         with self._driver.session(database=self.database) as session:
             return self._use_execute_read(session, _q)
 
-    def run_query_graph(self, cypher: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, List[Dict[str, Any]]]:
+    def run_query_iter(self, cypher: str, params: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily yield `record.data()` for each row of a read query, so large results can be
+        processed row by row without materializing them like `run_query` does.
+        The session stays open until the generator is exhausted or closed.
+        Unlike `run_query`, the query is not retried on transient errors, since rows may already
+        have been handed to the caller.
+
+        Example:
+        ```
+        for row in kg.run_query_iter("MATCH (n:Entity) RETURN n.name AS name"):
+            ...
+        ```
+        """
         params = params or {}
-        nodes: Dict[Any, Dict[str, Any]] = {}
-        rels: Dict[Any, Dict[str, Any]] = {}
+        self._ensure_driver()
+        with self._driver.session(database=self.database, default_access_mode=READ_ACCESS) as session:
+            with session.begin_transaction() as tx:
+                for record in tx.run(cypher, **params):
+                    yield record.data()
 
-        def _node_to_dict(n) -> Dict[str, Any]:
-            nid = getattr(n, "element_id", None) if hasattr(n, "element_id") else None
-            # If n doesn't expose element_id via driver object, use n.id replacement by caution:
-            # but since we use elementId(...) in queries, the record will contain ids as strings already.
-            try:
-                props = dict(n)
-                labels = list(getattr(n, "labels", []))
-                # driver may not provide numeric id in records if we used elementId in cypher,
-                # so handle both forms
-                return {"id": nid or getattr(n, "id", None), "labels": labels, "properties": props}
-            except Exception:
-                return {"value": n}
-
-        def _rel_to_dict(r) -> Dict[str, Any]:
-            try:
-                # records that include relation object may have attributes; best to return generic dict
-                rid = getattr(r, "id", None)
-                rtype = getattr(r, "type", getattr(r, "rel_type", None))
-                props = dict(r)
-                return {"id": rid, "type": rtype, "properties": props}
-            except Exception:
-                return {"value": r}
+    def run_query_graph(self, cypher: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, List[Dict[str, Any]]]:
+        params = params or {}
 
         def _q(tx):
+            nodes: Dict[str, Dict[str, Any]] = {}
+            rels: Dict[str, Dict[str, Any]] = {}
             res = tx.run(cypher, **params)
             for record in res:
                 for val in record.values():
-                    if hasattr(val, "id") and hasattr(val, "items"):
-                        nobj = _node_to_dict(val)
-                        if nobj.get("id") is not None:
-                            nodes[nobj["id"]] = nobj
-                    elif hasattr(val, "type") or hasattr(val, "start_node"):
-                        robj = _rel_to_dict(val)
-                        if "id" in robj and robj["id"] is not None:
-                            rels[robj["id"]] = robj
+                    # element_id is a unique string, so it can key the dicts directly
+                    if isinstance(val, Node):
+                        nodes[val.element_id] = {"id": val.element_id, "labels": list(val.labels), "properties": dict(val)}
+                    elif isinstance(val, Relationship):
+                        rels[val.element_id] = {
+                            "id": val.element_id,
+                            "type": val.type,
+                            "start": val.start_node.element_id,
+                            "end": val.end_node.element_id,
+                            "properties": dict(val),
+                        }
             return {"nodes": list(nodes.values()), "relationships": list(rels.values())}
 
         self._ensure_driver()
@@ -129,15 +271,16 @@ class KGConnector:
         """
         Find entity by exact id or name and return its direct nodes and relationships.
         Use `elementId(...)` to avoid deprecated `id(...)`.
+        Thin wrapper around `get_entity_connections_batch` for a single input.
 
         Parameters:
         - input_str: str - entity id (as string) or exact name to search.
 
         Returns:
         - Dict with keys:
-          - current_node: Dict with 'identity', 'labels', 'properties'
-          - direct_node: List of Dicts with 'identity', 'labels', 'properties'
-          - relations: List of Dicts with 'relation_name', 'start', 'end'
+          - current_node: Dict with 'identity' (elementId), 'labels', 'properties'
+          - direct_node: List of Dicts with 'identity' (elementId), 'labels', 'properties'
+          - relations: List of Dicts with 'relation_name', 'start', 'end' (elementIds)
 
         Example:
         ```
@@ -148,76 +291,261 @@ class KGConnector:
         with KGConnector() as kg:
             entity_data = kg.get_entity_connections("Huế")
         ```
-        -> ```{'current_node': {'identity': None, 'labels': ['Entity'], 'properties': {'name': 'Huế', 'id': 'Huế'}}, 'direct_node': [{'identity': 1307054, 'labels': ['Entity'], 'properties': {'name': 'Empire of Vietnam', 'id': 'Empire_of_Vietnam'}}, {'identity': 606675, 'labels': ['Entity'], 'properties': {'name': '"1993"', 'id': '"1993"'}}], 'relations': [{'relation_name': 'capital', 'start': '4:6de6b895-bb86-4aa5-9f9e-f625cd63cdad:1307054', 'end': '4:6de6b895-bb86-4aa5-9f9e-f625cd63cdad:966057'}, {'relation_name': 'year', 'start': '4:6de6b895-bb86-4aa5-9f9e-f625cd63cdad:966057', 'end': '4:6de6b895-bb86-4aa5-9f9e-f625cd63cdad:606675'}]}```
+        -> ```{'current_node': {'identity': '4:6de6b895-bb86-4aa5-9f9e-f625cd63cdad:966057', 'labels': ['Entity'], 'properties': {'name': 'Huế', 'id': 'Huế'}}, 'direct_node': [{'identity': '4:6de6b895-bb86-4aa5-9f9e-f625cd63cdad:1307054', 'labels': ['Entity'], 'properties': {'name': 'Empire of Vietnam', 'id': 'Empire_of_Vietnam'}}, {'identity': '4:6de6b895-bb86-4aa5-9f9e-f625cd63cdad:606675', 'labels': ['Entity'], 'properties': {'name': '"1993"', 'id': '"1993"'}}], 'relations': [{'relation_name': 'capital', 'start': '4:6de6b895-bb86-4aa5-9f9e-f625cd63cdad:1307054', 'end': '4:6de6b895-bb86-4aa5-9f9e-f625cd63cdad:966057'}, {'relation_name': 'year', 'start': '4:6de6b895-bb86-4aa5-9f9e-f625cd63cdad:966057', 'end': '4:6de6b895-bb86-4aa5-9f9e-f625cd63cdad:606675'}]}```
         """
+        return self.get_entity_connections_batch([input_str]).get(input_str, {})
 
-
-        cypher = """
-        MATCH (n:Entity)
-        WHERE elementId(n) = $input OR n.name = $input
-        MATCH (n)-[r]-(m:Entity)
-        RETURN n AS current_node,
-               collect(DISTINCT m) AS direct_node,
-               collect({relation_name: type(r), start: elementId(startNode(r)), end: elementId(endNode(r))}) AS relations
+    def get_entity_connections_batch(self, inputs: List[str], chunk_size: int = 500) -> Dict[str, Dict[str, Any]]:
         """
+        Batched version of `get_entity_connections`: resolve many entities with one
+        `UNWIND` query per chunk instead of one round-trip per entity.
 
-        def _q(tx):
-            res = tx.run(cypher, input=input_str)
-            row = res.single()
-            if not row:
-                return {}
-            current_node = {
-                "identity": row["current_node"] and (row["current_node"].get("elementId") if isinstance(row["current_node"], dict) else None)
-                # if current_node is a node object, we may instead use properties mapped below
-            }
-            # But since we returned node object as `n`, we should extract properties directly:
-            cur = row["current_node"]
-            current_node = {
-                "identity": row.get("current_node") and row.get("current_node").get("elementId", None) or None,
-                "labels": list(cur.labels) if hasattr(cur, "labels") else [],
-                "properties": dict(cur) if hasattr(cur, "items") else (cur or {})
-            }
-
-            direct_nodes = []
-            for m in row["direct_node"]:
-                direct_nodes.append({
-                    "identity": (m.get("elementId") if isinstance(m, dict) else None) or getattr(m, "id", None),
-                    "labels": list(m.labels) if hasattr(m, "labels") else [],
-                    "properties": dict(m) if hasattr(m, "items") else (m or {})
-                })
-
-            relations = []
-            for rel in row["relations"]:
-                # relation entries built by cypher: relation_name, start, end (start/end are elementId strings)
-                relations.append({
-                    "relation_name": rel.get("relation_name"),
-                    "start": rel.get("start"),
-                    "end": rel.get("end")
-                })
-
-            return {
-                "current_node": current_node,
-                "direct_node": direct_nodes,
-                "relations": relations
-            }
+        Parameters:
+        - inputs: List[str] - entity ids (as strings) or exact names to search.
+        - chunk_size: int - maximum number of inputs sent in a single query.
+
+        Returns:
+        - Dict keyed by input string, each value in the same format as `get_entity_connections`.
+          Inputs that match no entity are omitted.
+          Results are served from the instance cache when available; do not mutate them.
+
+        Example:
+        ```
+        with KGConnector() as kg:
+            entities = kg.get_entity_connections_batch(["Huế", "Hà Nội"])
+            hue = entities.get("Huế", {})
+        ```
+        """
+        # drop duplicates while keeping order, so each input is looked up once
+        inputs = list(dict.fromkeys(inputs))
+        results: Dict[str, Dict[str, Any]] = {}
+        missing = []
+        with self._cache_lock:
+            for input_str in inputs:
+                cached = self._cache.get(input_str)
+                if cached is None:
+                    missing.append(input_str)
+                elif cached:
+                    results[input_str] = cached
+
+        if missing:
+            found = self._get_entity_connections_uncached(missing, chunk_size)
+            if not self._cache.maxsize:
+                # cache_size=0 disables caching
+                results.update(found)
+                return results
+            with self._cache_lock:
+                for input_str in missing:
+                    # cache misses too, so unknown names do not hit the database again
+                    self._cache[input_str] = found.get(input_str, {})
+            results.update(found)
+        return results
+
+    def _get_entity_connections_uncached(self, inputs: List[str], chunk_size: int) -> Dict[str, Dict[str, Any]]:
+        results: Dict[str, Dict[str, Any]] = {}
+
+        def _q(tx, chunk):
+            res = tx.run(_ENTITY_CONNECTIONS_CYPHER, inputs=chunk)
+            found = {}
+            for row in res:
+                # an input may match several nodes (id and name); keep the first one, like `single()` did
+                if row["input"] not in found:
+                    found[row["input"]] = _parse_connection_row(row)
+            return found
 
         self._ensure_driver()
         with self._driver.session(database=self.database) as session:
-            result = self._use_execute_read(session, _q)
-            return result or {}
+            for i in range(0, len(inputs), chunk_size):
+                results.update(self._use_execute_read(session, _q, inputs[i:i + chunk_size]))
+        return results
 
     def generate_trie(self, save_to: Optional[str] = None) -> Trie:
         def _q(tx):
             result = tx.run("MATCH (n) WHERE n.name IS NOT NULL RETURN DISTINCT n.name AS name")
-            return [record["name"] for record in result if record["name"]]
+
+            # stream names record by record into the trie instead of building a list first
+            def _names():
+                # records are tuples, unpacking skips the key lookup
+                for (name,) in result:
+                    if name:
+                        yield name
+
+            return Trie(_names())
 
         self._ensure_driver()
         with self._driver.session(database=self.database) as session:
-            entities = self._use_execute_read(session, _q)
+            trie = self._use_execute_read(session, _q)
 
-        print(f"Total entities with names: {len(entities)}")
-        trie = Trie(entities)
+        print(f"Total entities with names: {len(trie)}")
         if save_to:
             print(f"Saving trie to {save_to}")
             trie.save_to_file(save_to)
-        return trie
\ No newline at end of file
+        return trie
+
+
+class AsyncKGConnector:
+    """
+    Asynchronous counterpart of `KGConnector` built on `neo4j.AsyncGraphDatabase`.
+    Lookups can be awaited concurrently (e.g. with `asyncio.gather`) so that bolt
+    round-trips overlap instead of running one after another.
+
+    Notes:
+    - The async driver is bound to the event loop it was created in, so it is owned by
+      the instance (not shared like `KGConnector`'s) and must be closed with `await close()`.
+    - Calling methods after `close()` raises an error.
+
+    Example:
+    ```
+    async with AsyncKGConnector() as kg:
+        entities = await kg.get_entity_connections_many(["Huế", "Hà Nội"])
+    ```
+    """
+
+    def __init__(
+        self,
+        uri: Optional[str] = None,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        database: Optional[str] = None,
+        **driver_kwargs: Any,
+    ):
+        self.uri = uri or os.getenv("KG_URI")
+        self.username = username or os.getenv("KG_USERNAME")
+        self.password = password or os.getenv("KG_PASSWORD")
+        self.database = database or os.getenv("KG_NAME", "neo4j")
+        if not self.uri or not self.username or not self.password:
+            raise EnvironmentError("KG_URI, KG_USERNAME and KG_PASSWORD must be set")
+
+        self._driver = None  # create lazily
+        self._driver_kwargs = {**_DEFAULT_DRIVER_KWARGS, **driver_kwargs}
+        self._closed = False
+
+    async def _ensure_driver(self):
+        if self._closed:
+            raise RuntimeError("AsyncKGConnector driver has been closed; create a new AsyncKGConnector instance.")
+        if self._driver is None:
+            # create driver on first use; published only once the schema is ensured (see KGConnector)
+            driver = AsyncGraphDatabase.driver(self.uri, auth=(self.username, self.password), **self._driver_kwargs)
+            try:
+                await self._ensure_schema(driver)
+            except BaseException:
+                await driver.close()
+                raise
+            self._driver = driver
+
+    async def ensure_indexes(self) -> None:
+        """Async version of `KGConnector.ensure_indexes`; shares its once-per-process bookkeeping."""
+        if self._driver is None:
+            await self._ensure_driver()
+        else:
+            await self._ensure_schema(self._driver)
+
+    async def _ensure_schema(self, driver) -> None:
+        key = (self.uri, self.database)
+        # the lock cannot be held across awaits: concurrent coroutines may both issue the
+        # (idempotent) DDL, but the shared set is only read and written under the lock
+        with KGConnector._indexes_lock:
+            if key in KGConnector._indexes_ensured:
+                return
+        async with driver.session(database=self.database) as session:
+            for ddl in _SCHEMA_DDL:
+                try:
+                    await (await session.run(ddl)).consume()
+                except Neo4jError as e:
+                    print(f"Skipping schema statement ({e.code}): {ddl}")
+        with KGConnector._indexes_lock:
+            KGConnector._indexes_ensured.add(key)
+
+    async def close(self) -> None:
+        if self._driver is not None:
+            try:
+                await self._driver.close()
+            finally:
+                self._driver = None
+        self._closed = True
+
+    async def __aenter__(self) -> "AsyncKGConnector":
+        # do not create driver until needed
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    async def count_nodes(self) -> int:
+        async def _q(tx: AsyncManagedTransaction):
+            res = await tx.run("MATCH (n) RETURN count(n)")
+            return (await res.single()).value() or 0
+
+        await self._ensure_driver()
+        async with self._driver.session(database=self.database) as session:
+            return await session.execute_read(_q)
+
+    async def run_query(self, cypher: str, params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        params = params or {}
+        async def _q(tx: AsyncManagedTransaction):
+            res = await tx.run(cypher, **params)
+            return [record.data() async for record in res]
+
+        await self._ensure_driver()
+        async with self._driver.session(database=self.database) as session:
+            return await session.execute_read(_q)
+
+    async def get_entity_connections(self, input_str: str) -> Dict[str, Any]:
+        """Async version of `KGConnector.get_entity_connections`."""
+        result = await self.get_entity_connections_batch([input_str])
+        return result.get(input_str, {})
+
+    async def get_entity_connections_batch(self, inputs: List[str], chunk_size: int = 500) -> Dict[str, Dict[str, Any]]:
+        """Async version of `KGConnector.get_entity_connections_batch`."""
+        inputs = list(dict.fromkeys(inputs))
+        results: Dict[str, Dict[str, Any]] = {}
+        if not inputs:
+            return results
+
+        async def _q(tx: AsyncManagedTransaction, chunk):
+            res = await tx.run(_ENTITY_CONNECTIONS_CYPHER, inputs=chunk)
+            found = {}
+            async for row in res:
+                if row["input"] not in found:
+                    found[row["input"]] = _parse_connection_row(row)
+            return found
+
+        await self._ensure_driver()
+        async with self._driver.session(database=self.database) as session:
+            for i in range(0, len(inputs), chunk_size):
+                results.update(await session.execute_read(_q, inputs[i:i + chunk_size]))
+        return results
+
+    async def get_entity_connections_many(
+        self,
+        inputs: List[str],
+        concurrency: Optional[int] = None,
+        chunk_size: int = 500,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Resolve many entities by running `get_entity_connections_batch` chunks concurrently.
+
+        Parameters:
+        - inputs: List[str] - entity ids (as strings) or exact names to search.
+        - concurrency: Optional[int] - maximum number of in-flight queries, defaults to the
+          driver's `max_connection_pool_size`.
+        - chunk_size: int - number of inputs per query.
+
+        Returns:
+        - Dict keyed by input string, same format as `get_entity_connections_batch`.
+        """
+        inputs = list(dict.fromkeys(inputs))
+        concurrency = concurrency or self._driver_kwargs["max_connection_pool_size"]
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _one(chunk):
+            async with semaphore:
+                return await self.get_entity_connections_batch(chunk, chunk_size)
+
+        # create the driver before fanning out so the tasks do not race to build it
+        await self._ensure_driver()
+        chunks = [inputs[i:i + chunk_size] for i in range(0, len(inputs), chunk_size)]
+        results: Dict[str, Dict[str, Any]] = {}
+        for found in await asyncio.gather(*[_one(chunk) for chunk in chunks]):
+            results.update(found)
+        return results
@@ -0,0 +1,67 @@
+import hashlib
+import os
+
+
+class CachedLLM:
+    """
+    Mixin for the Gemini wrappers: answers are cached on disk (`diskcache`), keyed by a
+    sha256 of model, system instruction, prompt, temperature and max output tokens,
+    so re-running a pipeline does not pay again for identical calls.
+
+    Subclasses set `self.client` and `self.use_cache`, and build their request as the
+    keyword arguments of `generate_content` (model, contents, config).
+    The cache directory is `LLM_CACHE_DIR` (default `.llm_cache`).
+    With `use_cache=False` the cache is not read, but fresh answers still overwrite it.
+    """
+
+    _cache = None  # shared by all wrappers, opened on first use
+
+    @staticmethod
+    def _get_cache():
+        if CachedLLM._cache is None:
+            import diskcache
+            CachedLLM._cache = diskcache.Cache(os.getenv("LLM_CACHE_DIR", ".llm_cache"))
+        return CachedLLM._cache
+
+    @staticmethod
+    def _cache_key(request: dict) -> str:
+        config = request["config"]
+        raw = "\x1f".join([
+            request["model"],
+            config.system_instruction or "",
+            request["contents"],
+            str(config.temperature),
+            str(config.max_output_tokens),
+        ])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _response_text(response) -> str:
+        if not response or not response.text:
+            raise ValueError("No response from the LLM model.")
+
+        return response.text.strip()
+
+    def _generate(self, request: dict) -> str:
+        cache = self._get_cache()
+        key = self._cache_key(request)
+        if self.use_cache:
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+
+        text = self._response_text(self.client.models.generate_content(**request))
+        cache.set(key, text)
+        return text
+
+    async def _agenerate(self, request: dict) -> str:
+        cache = self._get_cache()
+        key = self._cache_key(request)
+        if self.use_cache:
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+
+        text = self._response_text(await self.client.aio.models.generate_content(**request))
+        cache.set(key, text)
+        return text
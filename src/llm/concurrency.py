@@ -0,0 +1,23 @@
+import asyncio
+from typing import Any, Awaitable, Iterable, List
+
+
+async def gather_with_concurrency(aws: Iterable[Awaitable[Any]], limit: int = 20) -> List[Any]:
+    """
+    Await all `aws` concurrently, with at most `limit` of them in flight at once
+    (e.g. to stay inside the Gemini rate limit). Results keep the input order.
+
+    Example:
+    ```
+    llm = GeneralLLM()
+    answers = asyncio.run(gather_with_concurrency(
+        (llm.asubmit(claim, graph) for claim, graph in samples), limit=20))
+    ```
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def _one(aw):
+        async with semaphore:
+            return await aw
+
+    return await asyncio.gather(*(_one(aw) for aw in aws))
@@ -2,12 +2,16 @@ import os
 from google import genai
 from google.genai import types
 
-class GeneralLLM:
+from .cached_llm import CachedLLM
+
+
+class GeneralLLM(CachedLLM):
     # The client gets the API key from the environment variable `GEMINI_API_KEY`.
-    def __init__(self):
+    def __init__(self, use_cache: bool = True):
         self.client = genai.Client(api_key=os.getenv('GENERAL_LLM_API_KEY'))
+        self.use_cache = use_cache  # False: ignore cached answers (they are still refreshed)
 
-    def submit(self, claim: str, graph_string: str, max_tokens: int = 256) -> str:
+    def _request(self, claim: str, graph_string: str, max_tokens: int) -> dict:
         # Tạo prompt đúng định dạng trong paper ClaimPKG
         prompt = f"""
                     Claim: {claim}
@@ -19,7 +23,7 @@ class GeneralLLM:
                     Please answer with one of [Supported, Refuted, NotEnoughInfo]
                     and give a short explanation in one sentence.
                     """
-        response = self.client.models.generate_content(
+        return dict(
             model="gemini-2.0-flash",
             contents=prompt,
             config=types.GenerateContentConfig(
@@ -29,7 +33,9 @@ class GeneralLLM:
             )
         )
 
-        if not response or not response.text:
-            raise ValueError("No response from the LLM model.")
+    def submit(self, claim: str, graph_string: str, max_tokens: int = 256) -> str:
+        return self._generate(self._request(claim, graph_string, max_tokens))
 
-        return response.text.strip()
+    async def asubmit(self, claim: str, graph_string: str, max_tokens: int = 256) -> str:
+        # Same as `submit` but non-blocking, run many with `gather_with_concurrency`
+        return await self._agenerate(self._request(claim, graph_string, max_tokens))
@@ -3,13 +3,17 @@ from google import genai
 from google.genai import types
 from typing import Union
 
-class PseudoGraphRelabellingLLM:
+from .cached_llm import CachedLLM
+
+
+class PseudoGraphRelabellingLLM(CachedLLM):
     # The client gets the API key from the environment variable `GEMINI_API_KEY`.
-    def __init__(self):
+    def __init__(self, use_cache: bool = True):
         self.client = genai.Client(
             api_key=os.getenv('PSEUDOGRAPH_RELABELLING_API_KEY'))
+        self.use_cache = use_cache  # False: ignore cached answers (they are still refreshed)
 
-    def submit(self, claim_data: str, entities: Union[str, list], evidence: Union[str, dict], max_tokens: int = 32) -> str:
+    def _request(self, claim_data: str, entities: Union[str, list], evidence: Union[str, dict], max_tokens: int) -> dict:
 
         if isinstance(entities, list):
             entities = str(entities)
@@ -42,7 +46,7 @@ class PseudoGraphRelabellingLLM:
 
                 Correct triplet: <e>Romeo and Juliet</e> || written_by || <e>unknown_0</e>; <e>unknown_0</e> || continent_of || <e>Europe</e>
                 """
-        response = self.client.models.generate_content(
+        return dict(
             model="gemini-2.0-flash",
             contents=prompt,
             config=types.GenerateContentConfig(
@@ -52,7 +56,9 @@ class PseudoGraphRelabellingLLM:
             )
         )
 
-        if not response or not response.text:
-            raise ValueError("No response from the LLM model.")
+    def submit(self, claim_data: str, entities: Union[str, list], evidence: Union[str, dict], max_tokens: int = 32) -> str:
+        return self._generate(self._request(claim_data, entities, evidence, max_tokens))
 
-        return response.text.strip()
+    async def asubmit(self, claim_data: str, entities: Union[str, list], evidence: Union[str, dict], max_tokens: int = 32) -> str:
+        # Same as `submit` but non-blocking, run many with `gather_with_concurrency`
+        return await self._agenerate(self._request(claim_data, entities, evidence, max_tokens))
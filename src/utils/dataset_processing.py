@@ -1,15 +1,18 @@
-from typing import Dict, List, Tuple
+from itertools import product
+from typing import Dict, List, Optional, Tuple
 
-def generate_triplets(data, remove_underscore=False):
+def generate_triplets(data, remove_underscore=False, reverse_inverse=False):
     """
     Tạo triplets pseudo-subgraph tổng quát từ dict chứa 'Evidence'.
     - Xử lý quan hệ bình thường, quan hệ đảo ngược (~relation)
     - Tạo placeholder unknown_i cho các tail chưa xác định (question/existence claim)
     - remove_underscore=True: thay underscore bằng space cho entity names (không đổi unknown_i)
+    - reverse_inverse=True: triplet của quan hệ đảo ngược được ghi là (tail, relation, entity)
 
     Args:
         data (dict): dict chứa 'Entity_set' và 'Evidence'
         remove_underscore (bool): True để thay '_' bằng ' ', False giữ nguyên
+        reverse_inverse (bool): True để đảo head/tail cho ~relation, False giữ (entity, relation, tail)
 
     Returns:
         dict: dict với key 'triplet' là list of (head, relation, tail)
@@ -29,35 +32,35 @@ def generate_triplets(data, remove_underscore=False):
 
     for entity, rel_lists in data.get('Evidence', {}).items():
         entity_std = std_entity(entity)
+        # tails không đổi theo relation nên chỉ tính một lần cho mỗi entity
+        # (entity_set đã được chuẩn hóa, không cần gọi lại std_entity)
+        tails = [e for e in entity_set if e != entity_std]
         for rel_list in rel_lists:
             for r in rel_list:
-                if r.startswith('~'):
-                    relation = r[1:]
-                    tails = [std_entity(e) for e in entity_set if e != entity_std]
-                    if not tails:
-                        tail = f'unknown_{unknown_count}'
-                        unknown_count += 1
-                        # triplets.append((, relation, ))
-                        triplets.append((entity_std, relation, tail))
-                    else:
-                        for tail in tails:
-                            triplets.append((entity_std, relation, tail))
+                inverse = r.startswith('~')
+                relation = r[1:] if inverse else r
+                if tails:
+                    cand_tails = tails
                 else:
-                    tails = [std_entity(e) for e in entity_set if e != entity_std]
-                    if not tails:
-                        tail = f'unknown_{unknown_count}'
-                        unknown_count += 1
-                        triplets.append((entity_std, r, tail))
-                    else:
-                        for tail in tails:
-                            triplets.append((entity_std, r, tail))
+                    cand_tails = (f'unknown_{unknown_count}',)
+                    unknown_count += 1
+                # mặc định ~relation chỉ bỏ dấu ~; reverse_inverse đảo head/tail
+                if inverse and reverse_inverse:
+                    triplets.extend(product(cand_tails, (relation,), (entity_std,)))
+                else:
+                    triplets.extend(product((entity_std,), (relation,), cand_tails))
 
     data['triplet'] = triplets
     return data
 
-def generate_claimpkg_triplets(sample,
-                               remove_underscore=False,
-                               unknown_prefix="unknown_"):
+def _claimpkg_groups(sample, remove_underscore, unknown_prefix):
+    """
+    Resolve the nodes of a sample for `generate_claimpkg_triplets`.
+
+    Returns (groups, dedupe): `groups` is a list of (head, relations, tails), where `relations`
+    is a list of (relation, inverse) in evidence order and every relation links `head` to each
+    tail (tails to head when inverse); `dedupe` tells whether duplicate triplets are dropped.
+    """
     entity_set = sample["Entity_set"]
     evidence = sample["Evidence"]
 
@@ -66,8 +69,12 @@ def generate_claimpkg_triplets(sample,
             return e.replace("_", " ")
         return e
 
-    # standardize names
-    entity_set_std = [norm(e) for e in entity_set]
+    # entity_set is often a list; membership tests go through a frozenset
+    entity_set_f = frozenset(entity_set)
+
+    # standardize names once per sample
+    norm_map = {e: norm(e) for e in entity_set}
+    entity_set_std = [norm_map[e] for e in entity_set]
 
     # unknown node mapping
     unk_map = {}
@@ -80,62 +87,67 @@ def generate_claimpkg_triplets(sample,
         return u
 
     def resolve_entity(e):
-        if e in entity_set:
-            return norm(e)
+        if e in entity_set_f:
+            return norm_map[e]
         # any implicit node labeled in evidence but not in entity_set becomes unknown
         if e not in unk_map:
             unk_map[e] = new_unknown()
         return unk_map[e]
 
-    triplets = []
+    def relations_of(rel_lists):
+        # relations keep their original order so the triplet order is unchanged
+        return [(r[1:], True) if r.startswith("~") else (r, False)
+                for rel_group in rel_lists for r in rel_group]
 
     # CASE 1: Only one entity in the claim
     if len(entity_set) == 1:
         head = entity_set_std[0]
         tail = new_unknown()  # always unknown_0
-        for rel_lists in evidence.values():
-            for rel_group in rel_lists:
-                for r in rel_group:
-                    if r.startswith("~"):
-                        triplets.append((tail, r[1:], head))
-                    else:
-                        triplets.append((head, r, tail))
-        sample['triplet'] = triplets
-        return sample
+        relations = [rel for rel_lists in evidence.values() for rel in relations_of(rel_lists)]
+        return [(head, relations, [tail])], False
 
     # CASE 2+: Two or more entities
     # Build unknown map for implicit nodes
-    explicit = set(entity_set)
-    implicit = set(evidence.keys()) - explicit
+    implicit = set(evidence.keys()) - entity_set_f
     for imp in implicit:
         resolve_entity(imp)
 
-    # All nodes available
-    all_nodes = [norm(e) for e in entity_set] + list(unk_map.values())
+    # All nodes available (each once, so "every other node" is a single slice)
+    all_nodes = list(dict.fromkeys(entity_set_std + list(unk_map.values())))
+    node_index = {n: i for i, n in enumerate(all_nodes)}
 
-    # generate triplets
+    groups = []
     for ent, rel_lists in evidence.items():
         head = resolve_entity(ent)
         # tails = every other node
-        tails = [t for t in all_nodes if t != head]
-
-        for rel_group in rel_lists:
-            for r in rel_group:
-                if r.startswith("~"):  # inverse
-                    rel = r[1:]
-                    for t in tails:
-                        triplets.append((t, rel, head))
-                else:                 # forward
-                    for t in tails:
-                        triplets.append((head, r, t))
-
-    # dedupe
-    triplets = list(dict.fromkeys(triplets))
-    sample['triplet'] = triplets
+        i = node_index.get(head)
+        tails = all_nodes if i is None else all_nodes[:i] + all_nodes[i + 1:]
+        groups.append((head, relations_of(rel_lists), tails))
+    return groups, True
+
+
+def generate_claimpkg_triplets(sample,
+                               remove_underscore=False,
+                               unknown_prefix="unknown_"):
+    groups, dedupe = _claimpkg_groups(sample, remove_underscore, unknown_prefix)
+
+    # with dedupe the dict is an insertion-ordered set, so duplicates
+    # are dropped as they are produced instead of in a pass at the end
+    triplets = {} if dedupe else []
+    emit = (lambda ts: triplets.update(dict.fromkeys(ts))) if dedupe else triplets.extend
+    for head, relations, tails in groups:
+        head_tuple = (head,)
+        for rel, inverse in relations:
+            # inverse relations swap head and tails instead of taking a separate branch
+            h, t = (tails, head_tuple) if inverse else (head_tuple, tails)
+            emit(product(h, (rel,), t))
+
+    sample['triplet'] = list(triplets)
     return sample
 
 
-def process_data(data: dict, remove_underscore: bool = True) -> Tuple[Dict, List]:
+def process_data(data: dict,
+                 remove_underscore: bool = True) -> Tuple[Dict, List]:
     from tqdm import tqdm
     """
     Create triplets from given FactKG structure.
@@ -146,11 +158,11 @@ def process_data(data: dict, remove_underscore: bool = True) -> Tuple[Dict, List
 
     Returns:
     - Tuple[Dict, List]: A tuple containing the updated data dictionary and the list distinct entity used for later update the trie.
+      Samples are updated in place: `data[key]` and `updated_data[key]` are the same dict.
     """
     updated_data = {}
     distinct_entities = set()
-    keys = list(data.keys())
-    for key in tqdm(keys, desc="Processing data"):
+    for key in tqdm(data, desc="Processing data"):
         updated = generate_claimpkg_triplets(data[key], remove_underscore)
         updated_data[key] = updated
 
@@ -160,4 +172,218 @@ def process_data(data: dict, remove_underscore: bool = True) -> Tuple[Dict, List
             distinct_entities.add(triplet[0])
             distinct_entities.add(triplet[2])
 
-    return updated_data, list(distinct_entities)
\ No newline at end of file
+    return updated_data, list(distinct_entities)
+
+
+class EntityInterner:
+    """
+    Map strings (entity or relation names) to dense int ids and back.
+    Every name is stored once, so repeated names share a single Python object.
+
+    Example:
+    ```
+    >>> entities = EntityInterner()
+    >>> entities("Vedat Tek"), entities("Istanbul"), entities("Vedat Tek")
+    (0, 1, 0)
+    >>> entities.id_to_name[1]
+    'Istanbul'
+    ```
+    """
+
+    def __init__(self):
+        self.name_to_id: Dict[str, int] = {}
+        self.id_to_name: List[str] = []
+
+    def __call__(self, name: str) -> int:
+        idx = self.name_to_id.get(name)
+        if idx is None:
+            idx = len(self.id_to_name)
+            self.name_to_id[name] = idx
+            self.id_to_name.append(name)
+        return idx
+
+    def __len__(self) -> int:
+        return len(self.id_to_name)
+
+
+def build_triplet_arrays(updated_data: dict,
+                         entities: Optional[EntityInterner] = None,
+                         relations: Optional[EntityInterner] = None):
+    """
+    Encode the triplets produced by `process_data` column-wise as int32 ids instead of
+    millions of (head, relation, tail) string tuples.
+    The string tuples must exist first; use `process_data_arrays(data)` to build
+    the same arrays without them when memory is the concern.
+
+    Parameters:
+    - updated_data (dict): Output of `process_data`, every sample holding a 'triplet' list.
+    - entities (EntityInterner, optional): Interner for heads/tails, reused across calls if given.
+    - relations (EntityInterner, optional): Interner for relations, reused across calls if given.
+
+    Returns:
+    - Tuple of:
+      - triplets (np.ndarray): shape (N, 3), dtype int32, rows of (head_id, relation_id, tail_id).
+      - offsets (np.ndarray): shape (len(updated_data) + 1,), the rows of the i-th sample
+        (in `updated_data` key order) are `triplets[offsets[i]:offsets[i + 1]]`.
+      - entities (EntityInterner): `entities.id_to_name` are the distinct entities.
+      - relations (EntityInterner): `relations.id_to_name` are the distinct relations.
+
+    Example:
+    ```
+    updated_data, _ = process_data(data)
+    triplets, offsets, entities, relations = build_triplet_arrays(updated_data)
+    h, r, t = triplets[0]
+    entities.id_to_name[h], relations.id_to_name[r], entities.id_to_name[t]
+    ```
+    """
+    import numpy as np
+
+    entities = entities if entities is not None else EntityInterner()
+    relations = relations if relations is not None else EntityInterner()
+
+    counts = [len(sample["triplet"]) for sample in updated_data.values()]
+    offsets = np.cumsum([0] + counts, dtype=np.int64)
+
+    def _ids():
+        for sample in updated_data.values():
+            for head, rel, tail in sample["triplet"]:
+                yield entities(head)
+                yield relations(rel)
+                yield entities(tail)
+
+    total = int(offsets[-1])
+    triplets = np.fromiter(_ids(), dtype=np.int32, count=3 * total).reshape(total, 3)
+
+    return triplets, offsets, entities, relations
+
+
+def _claimpkg_triplet_ids(samples,
+                          entities: EntityInterner,
+                          relations: EntityInterner,
+                          remove_underscore=False,
+                          unknown_prefix="unknown_"):
+    # Triplets of a batch of samples as interned int32 ids (same rows and order as
+    # `generate_claimpkg_triplets`). Python only walks the (head, relations, tails) groups;
+    # the rows are expanded and deduplicated with vectorized NumPy over the whole batch.
+    # Returns (triplets (N, 3) int32, number of rows of each sample).
+    import numpy as np
+
+    # one entry per (group, relation): its rows pair the head with tails[start:start + count]
+    heads, rels, inverse, tail_start, tail_count, tails = [], [], [], [], [], []
+    sample_rows, sample_dedupe = [], []
+    for sample in samples:
+        groups, dedupe = _claimpkg_groups(sample, remove_underscore, unknown_prefix)
+        n_rows = 0
+        for head, group_rels, group_tails in groups:
+            if not group_rels:
+                continue
+            head_id = entities(head)
+            start = len(tails)
+            tails.extend([entities(t) for t in group_tails])
+            for rel, inv in group_rels:
+                heads.append(head_id)
+                rels.append(relations(rel))
+                inverse.append(inv)
+                tail_start.append(start)
+                tail_count.append(len(group_tails))
+            n_rows += len(group_rels) * len(group_tails)
+        sample_rows.append(n_rows)
+        sample_dedupe.append(dedupe)
+
+    sample_rows = np.array(sample_rows, dtype=np.int64)
+    counts = np.array(tail_count, dtype=np.int64)
+    total = int(counts.sum())
+    if total == 0:
+        return np.empty((0, 3), dtype=np.int32), sample_rows
+
+    # expand every entry into its rows
+    entry = np.repeat(np.arange(len(counts)), counts)
+    row_in_entry = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    tail_ids = np.array(tails, dtype=np.int32)[np.array(tail_start, dtype=np.int64)[entry] + row_in_entry]
+    head_ids = np.array(heads, dtype=np.int32)[entry]
+    inv = np.array(inverse, dtype=np.bool_)[entry]
+    out = np.empty((total, 3), dtype=np.int32)
+    # inverse relations swap head and tail
+    out[:, 0] = np.where(inv, tail_ids, head_ids)
+    out[:, 1] = np.array(rels, dtype=np.int32)[entry]
+    out[:, 2] = np.where(inv, head_ids, tail_ids)
+
+    sample_dedupe = np.array(sample_dedupe, dtype=np.bool_)
+    if sample_dedupe.any():
+        # keep the first occurrence of every row within its sample: lexsort is stable, so in each
+        # run of equal (sample, head, relation, tail) the first sorted row is the first occurrence
+        sample_of_row = np.repeat(np.arange(len(sample_rows)), sample_rows)
+        order = np.lexsort((out[:, 2], out[:, 1], out[:, 0], sample_of_row))
+        sorted_rows = out[order]
+        sorted_samples = sample_of_row[order]
+        first = np.ones(total, dtype=np.bool_)
+        first[1:] = (sorted_samples[1:] != sorted_samples[:-1]) | (sorted_rows[1:] != sorted_rows[:-1]).any(axis=1)
+        keep = ~sample_dedupe[sample_of_row]
+        keep[order[first]] = True
+        out = out[keep]
+        sample_rows = np.bincount(sample_of_row[keep], minlength=len(sample_rows)).astype(np.int64)
+    return out, sample_rows
+
+
+def generate_claimpkg_triplet_ids(sample,
+                                  entities: EntityInterner,
+                                  relations: EntityInterner,
+                                  remove_underscore=False,
+                                  unknown_prefix="unknown_"):
+    """
+    Same triplets as `generate_claimpkg_triplets` (same order), but produced as an int32
+    array of interned ids instead of Python string tuples. To convert a whole dataset,
+    `process_data_arrays` batches many samples per NumPy pass, which is much faster.
+
+    Parameters:
+    - sample (dict): FactKG sample containing 'Entity_set' and 'Evidence'.
+    - entities (EntityInterner): Interner for heads/tails, shared across samples.
+    - relations (EntityInterner): Interner for relations, shared across samples.
+    - remove_underscore (bool): If True, replace underscores with spaces in entity names.
+    - unknown_prefix (str): Prefix of the placeholder names for unknown nodes.
+
+    Returns:
+    - np.ndarray: shape (N, 3), dtype int32, rows of (head_id, relation_id, tail_id).
+    """
+    return _claimpkg_triplet_ids([sample], entities, relations, remove_underscore, unknown_prefix)[0]
+
+
+def process_data_arrays(data: dict,
+                        remove_underscore: bool = True,
+                        batch_size: int = 10_000):
+    """
+    Same triplets as `process_data`, returned directly as interned int32 arrays (the format of
+    `build_triplet_arrays`): samples are converted batch by batch, so the (head, relation, tail)
+    string tuples are never built and peak memory stays far lower. `data` is left unchanged.
+
+    Parameters:
+    - data (dict): Input data containing 'Entity_set' and 'Evidence'.
+    - remove_underscore (bool): If True, replace underscores with spaces in entity names.
+    - batch_size (int): Number of samples converted per NumPy pass.
+
+    Returns:
+    - Tuple of (triplets, offsets, entities, relations) as in `build_triplet_arrays`;
+      the distinct entities are `entities.id_to_name`.
+
+    Example:
+    ```
+    triplets, offsets, entities, relations = process_data_arrays(data)
+    h, r, t = triplets[offsets[0]]
+    entities.id_to_name[h], relations.id_to_name[r], entities.id_to_name[t]
+    ```
+    """
+    import numpy as np
+    from tqdm import tqdm
+
+    entities = EntityInterner()
+    relations = EntityInterner()
+    keys = list(data)
+    blocks, counts = [], []
+    for i in tqdm(range(0, len(keys), batch_size), desc="Processing data"):
+        triplets, rows = _claimpkg_triplet_ids(
+            [data[key] for key in keys[i:i + batch_size]], entities, relations, remove_underscore)
+        blocks.append(triplets)
+        counts.append(rows)
+    offsets = np.concatenate([[0]] + counts).cumsum().astype(np.int64)
+    triplets = np.concatenate(blocks) if blocks else np.empty((0, 3), dtype=np.int32)
+    return triplets, offsets, entities, relations
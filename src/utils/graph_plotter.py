@@ -1,7 +1,36 @@
-def plot_entity_graph(data: dict):
+def _layout(G, iterations: int = 50) -> dict:
+    """
+    Compute node positions, using igraph's C implementation of Fruchterman-Reingold when
+    `python-igraph` is installed and falling back to `nx.spring_layout` otherwise.
+    """
+    nodes = list(G.nodes())
+    try:
+        import igraph as ig
+    except ImportError:
+        import networkx as nx
+        return nx.spring_layout(G, seed=42, iterations=iterations)
+
+    import random
+
+    index = {nid: i for i, nid in enumerate(nodes)}
+    g = ig.Graph(n=len(nodes), edges=[(index[s], index[e]) for s, e in G.edges()], directed=True)
+    # fixed initial positions and a seeded RNG (restored afterwards), so the same entity is
+    # drawn the same way on every run, like spring_layout(seed=42)
+    rng = random.Random(42)
+    initial = [[rng.random(), rng.random()] for _ in nodes]
+    ig.set_random_number_generator(random.Random(42))
+    try:
+        coords = g.layout_fruchterman_reingold(seed=initial, niter=iterations).coords
+    finally:
+        ig.set_random_number_generator(random)
+    return dict(zip(nodes, coords))
+
+
+def plot_entity_graph(data: dict, iterations: int = 50):
     """
     Plot a directed graph of an entity and its direct connections.
     Supports multiple relations between the same nodes by merging labels.
+    `iterations` bounds the layout solver; lower it for large neighbourhoods.
     """
     import networkx as nx
     import matplotlib.pyplot as plt
@@ -30,7 +59,7 @@ def plot_entity_graph(data: dict):
         G.add_edge(start_id, end_id)  # ensure edge exists
 
     # layout
-    pos = nx.spring_layout(G, seed=42)
+    pos = _layout(G, iterations)
 
     # draw nodes
     nx.draw(
@@ -0,0 +1,28 @@
+from typing import Callable, Optional
+
+
+def lazy_njit(func: Callable, **options) -> Callable[[], Optional[Callable]]:
+    """
+    Compile `func` with numba's `njit(**options)` on first use.
+
+    numba is optional and slow to import, so nothing is imported until the returned getter
+    is called. The getter returns the compiled function, or None when numba is not installed
+    (callers then fall back to plain Python or NumPy).
+
+    Example:
+    _get_kernel = lazy_njit(_kernel, cache=True)
+    kernel = _get_kernel() or _kernel
+    """
+    compiled = None
+
+    def get() -> Optional[Callable]:
+        nonlocal compiled
+        if compiled is None:
+            try:
+                from numba import njit
+                compiled = njit(**options)(func)
+            except ImportError:
+                compiled = False
+        return compiled or None
+
+    return get
@@ -1,5 +1,10 @@
+import re
 from typing import Tuple
 
+_ENT_RE = re.compile(r'<e>\s*(.*?)\s*</e>', re.IGNORECASE)
+_WS_RE = re.compile(r'\s+')
+_NEG_RE = re.compile(r'^~\s*')
+
 
 def str_to_triplet(s: str) -> Tuple[str, str, str]:
     """
@@ -22,24 +27,30 @@ def str_to_triplet(s: str) -> Tuple[str, str, str]:
     Raises:
       ValueError: if the input does not split into exactly three parts using '||'.
     """
-    import re
-
     def _extract_entity(part: str) -> str:
+        # Fast path for the common "<e>...</e>" form: plain slicing, no regex.
+        # Anything else (upper-case tags, text around the tags, newlines) goes through the regex.
+        if len(part) >= 7 and part[:3] == '<e>' and part[-4:] == '</e>':
+            inner = part[3:-4]
+            if '</' not in inner and '\n' not in inner:
+                return inner.strip()
         # If part contains <e>...</e>, return inner text; otherwise return trimmed token.
-        m = re.search(r'<e>\s*(.*?)\s*</e>', part, flags=re.IGNORECASE)
+        m = _ENT_RE.search(part)
         return m.group(1) if m else part.strip()
 
-    parts = [p.strip() for p in s.split('||')]
-    if len(parts) != 3:
+    # maxsplit stops scanning after the second separator; a third one means too many parts
+    parts = s.split('||', 2)
+    if len(parts) != 3 or '||' in parts[2]:
         raise ValueError(
-            f"Expected 3 parts separated by '||', got {len(parts)}: {s!r}")
+            f"Expected 3 parts separated by '||', got {s.count('||') + 1}: {s!r}")
+    parts = [p.strip() for p in parts]
 
     ent1 = _extract_entity(parts[0])
     relation = parts[1]
     # Collapse internal whitespace and trim
-    relation = re.sub(r'\s+', ' ', relation).strip()
+    relation = _WS_RE.sub(' ', relation).strip()
     # Normalize leading negation: ensure '~' is attached to the relation token (no spaces after '~')
-    relation = re.sub(r'^\~\s*', '~', relation)
+    relation = _NEG_RE.sub('~', relation)
 
     ent2 = _extract_entity(parts[2])
     return ent1, relation, ent2
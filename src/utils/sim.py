@@ -1,18 +1,217 @@
-import torch.nn.functional as F
+import os
 import torch
-from typing import Tuple, List, Dict, Callable
+import numpy as np
+from sentence_transformers import SentenceTransformer
+from collections import defaultdict
+from functools import lru_cache
+from typing import Tuple, List, Dict, Callable, Iterable, Optional
 from heapq import nlargest
+from operator import itemgetter
+from .jit import lazy_njit
+
+def _aggregate(cand_ids, pseudo_ids, rel_ids, S, out_sum, out_cnt):
+    # Kernel of `Similarity._score_candidates`: for every matched edge, gathers the
+    # (pseudo relation, KG relation) similarity from `S` and adds it to its candidate's sum.
+    # Compiled by numba if available.
+    for i in range(cand_ids.shape[0]):
+        out_sum[cand_ids[i]] += S[pseudo_ids[i], rel_ids[i]]
+        out_cnt[cand_ids[i]] += 1
+
+
+_get_aggregate_kernel = lazy_njit(_aggregate, fastmath=True, cache=True)
+
+
+class KGIndex:
+    """
+    Inverted index (head, tail) -> [relations] of a KG, so that the relations linking an explicit
+    entity to a candidate are found in O(1) instead of scanning the entity's edges, and
+    tail -> heads, so that explicit entities not linked to a candidate are skipped.
+    Built by `Similarity.build_index` and passed to `score`/`rank_candidates` through `index`.
+    It is a snapshot: rebuild it after editing the KG.
+    """
+
+    def __init__(self, KG: Dict[str, List[Tuple[str, str]]]):
+        pairs = defaultdict(list)
+        heads_by_tail = defaultdict(set)
+        for head, edges in KG.items():
+            for r, tail in edges:
+                pairs[(head, tail)].append(r)
+                heads_by_tail[tail].add(head)
+        self.pairs: Dict[Tuple[str, str], List[str]] = dict(pairs)
+        self.heads_by_tail: Dict[str, set] = dict(heads_by_tail)
+
 
 class Similarity:
-    def __init__(self, encoder_model: str = "BAAI/bge-large-en-v1.5"):
+    # minimum number of strings for `multi_process` encoding to use the worker pool
+    MULTI_PROCESS_MIN_TEXTS = 256
+    # default number of CPU workers of the `multi_process` pool (sentence-transformers' own default);
+    # each holds a full copy of the model
+    MULTI_PROCESS_CPU_WORKERS = 4
+    # rows of the int8 candidate matrix upcast to FP32 at a time when scoring (see `quantize`)
+    QUANTIZED_BLOCK_ROWS = 4096
+
+    def __init__(
+        self,
+        encoder_model: str = "BAAI/bge-large-en-v1.5",
+        half_precision: Optional[bool] = None,
+        encoder_backend: str = "torch",
+        onnx_file_name: Optional[str] = None,
+        multi_process: bool = False,
+        pool_devices: Optional[List[str]] = None,
+        quantize: bool = False,
+    ):
         """
         Initialize the Similarity class with a specified encoder model.
         Parameters:
             encoder_model (str): The name of the pretrained model to use for encoding.
+            half_precision (bool, optional): Run the encoder in FP16 (BF16 on GPUs supporting it).
+                Defaults to True when the encoder runs on CUDA. Embeddings are still normalized in FP32.
+                Only applies to the "torch" backend.
+            encoder_backend (str): "torch" (default) or "onnx" to run inference with ONNX Runtime
+                (requires `sentence-transformers[onnx]` or `[onnx-gpu]`); the model is exported on first load.
+            onnx_file_name (str, optional): ONNX file to load for the "onnx" backend, e.g. an optimized or
+                int8-quantized export such as "onnx/model_O3.onnx" or "onnx/model_qint8_avx512_vnni.onnx".
+            multi_process (bool): Encode large batches (more than `MULTI_PROCESS_MIN_TEXTS` strings) with a pool
+                of worker processes, one per device of `pool_devices`. The pool is started on first use;
+                call `close()` to stop it. Ignored when there is a single device (no parallelism to gain).
+            pool_devices (List[str], optional): Devices of the `multi_process` workers, e.g. ["cuda:0", "cuda:1"]
+                or ["cpu"] * 8. Defaults to every CUDA device, or `MULTI_PROCESS_CPU_WORKERS` CPU workers.
+                CPU workers share the cores: each runs torch with cpu_count // n_workers threads
+                (unless OMP_NUM_THREADS is set).
+            quantize (bool): Keep the `batch_sim` candidate embeddings as symmetric int8 (x * 127) instead
+                of FP32, 4x less memory for large candidate vocabularies. Ranking is nearly unchanged.
+                Queries upcast `QUANTIZED_BLOCK_ROWS` rows at a time, never the whole matrix.
         """
-        from sentence_transformers import SentenceTransformer
+        model_kwargs = {}
+        if encoder_backend == "onnx":
+            model_kwargs["provider"] = "CUDAExecutionProvider" if torch.cuda.is_available() else "CPUExecutionProvider"
+            if onnx_file_name:
+                model_kwargs["file_name"] = onnx_file_name
+        self.encoder = SentenceTransformer(encoder_model, backend=encoder_backend, model_kwargs=model_kwargs or None)
+        if half_precision is None:
+            half_precision = encoder_backend == "torch" and self.encoder.device.type == "cuda"
+        if half_precision and encoder_backend == "torch":
+            # BF16 keeps the FP32 exponent range, prefer it on GPUs that support it
+            if self.encoder.device.type == "cuda" and torch.cuda.is_bf16_supported():
+                self.encoder = self.encoder.to(torch.bfloat16)
+            else:
+                self.encoder = self.encoder.half()
+        self.multi_process = multi_process
+        self.pool_devices = pool_devices
+        self._pool = None  # started lazily by `_encode`
+        # relation string -> normalized embedding, filled by `_embed_many`
+        self._emb_cache: Dict[str, np.ndarray] = {}
+        self.quantize = quantize
+        # candidate matrix of the last `batch_sim` call (int8 when `quantize`), see `_candidate_matrix`
+        self._cand_key = None
+        # candidate string -> int8 embedding row, filled by `_candidate_matrix` when `quantize`
+        self._int8_cache: Dict[str, np.ndarray] = {}
+        self._cand_matrix = None
+        self._cand_tensor = None  # copy of `_cand_matrix` on the encoder's CUDA device
 
-        self.encoder = SentenceTransformer(encoder_model)
+    def _get_devices(self) -> List[str]:
+        if self.pool_devices is not None:
+            return list(self.pool_devices)
+        if torch.cuda.is_available():
+            return [f"cuda:{i}" for i in range(torch.cuda.device_count())]
+        return ["cpu"] * self.MULTI_PROCESS_CPU_WORKERS
+
+    def _get_pool(self):
+        """
+        Start the `multi_process` pool on first use. Returns None when there is a single device,
+        in which case encoding stays in this process.
+        """
+        if self._pool is None:
+            devices = self._get_devices()
+            if len(devices) < 2:
+                return None
+            n_cpu = devices.count("cpu")
+            if n_cpu and "OMP_NUM_THREADS" not in os.environ:
+                # workers are spawned with this environment: split the cores between the CPU workers
+                # instead of letting every worker's torch use all of them
+                os.environ["OMP_NUM_THREADS"] = str(max(1, (os.cpu_count() or 1) // n_cpu))
+                try:
+                    self._pool = self.encoder.start_multi_process_pool(devices)
+                finally:
+                    del os.environ["OMP_NUM_THREADS"]
+            else:
+                self._pool = self.encoder.start_multi_process_pool(devices)
+        return self._pool
+
+    def close(self) -> None:
+        """
+        Stop the encoding worker processes started with `multi_process=True`, if any.
+        """
+        if self._pool is not None:
+            self.encoder.stop_multi_process_pool(self._pool)
+            self._pool = None
+
+    def _encode(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        """
+        Encode `texts` into L2-normalized float32 embeddings. Normalization is done here in FP32
+        rather than by the encoder, which may run in half precision.
+        """
+        # large inputs only: for small ones the inter-process overhead outweighs the gain
+        pool = self._get_pool() if self.multi_process and len(texts) > self.MULTI_PROCESS_MIN_TEXTS else None
+        if pool is not None:
+            # encode() length-sorts only inside each worker's chunk, so sort globally first
+            # to give every chunk uniform lengths (less padding), then restore the input order
+            order = np.argsort([len(t) for t in texts], kind="stable")
+            embeds = self.encoder.encode([texts[i] for i in order], pool=pool,
+                                         batch_size=64, convert_to_numpy=True)
+            embeds = np.asarray(embeds)[np.argsort(order)]
+        else:
+            embeds = self.encoder.encode(texts, convert_to_numpy=True, batch_size=batch_size)
+        embeds = np.asarray(embeds, dtype=np.float32)
+        embeds /= np.maximum(np.linalg.norm(embeds, axis=1, keepdims=True), 1e-12)
+        return embeds
+
+    def _embed_many(self, texts: Iterable[str]) -> None:
+        """
+        Encode, in a single batch, every string of `texts` that is not cached yet.
+        """
+        missing = [t for t in dict.fromkeys(texts) if t not in self._emb_cache]
+        if missing:
+            embeds = self._encode(missing, batch_size=256)
+            self._emb_cache.update(zip(missing, embeds))
+
+    def _candidate_matrix(self, candidates: List[str]) -> np.ndarray:
+        """
+        (n_candidates, dim) embedding matrix of `candidates`, kept until the candidate list changes.
+        With `quantize`, the matrix is int8 and candidate embeddings are cached as int8 rows
+        (`_int8_cache`) instead of FP32, so they are still encoded only once across calls.
+        """
+        key = tuple(candidates)
+        if key != self._cand_key:
+            if self.quantize:
+                missing = [c for c in dict.fromkeys(candidates) if c not in self._int8_cache]
+                to_encode = [c for c in missing if c not in self._emb_cache]
+                encoded = dict(zip(to_encode, self._encode(to_encode, batch_size=256))) if to_encode else {}
+                for c in missing:
+                    emb = self._emb_cache[c] if c in self._emb_cache else encoded[c]
+                    self._int8_cache[c] = np.round(emb * 127).astype(np.int8)
+                M = np.stack([self._int8_cache[c] for c in candidates])
+            else:
+                self._embed_many(candidates)
+                M = np.stack([self._emb_cache[c] for c in candidates])
+            self._cand_key, self._cand_matrix, self._cand_tensor = key, M, None
+        return self._cand_matrix
+
+    def save_embeddings(self, path: str) -> None:
+        """
+        Save the embedding cache to `path` (NumPy .npz), so that another process using the same
+        encoder can reuse it with `load_embeddings` instead of encoding the strings again.
+        """
+        keys = list(self._emb_cache)
+        embeddings = np.stack([self._emb_cache[k] for k in keys]) if keys else np.zeros((0, 0), dtype=np.float32)
+        np.savez(path, keys=np.array(keys, dtype=np.str_), embeddings=embeddings)
+
+    def load_embeddings(self, path: str) -> None:
+        """
+        Add the embeddings saved by `save_embeddings` to the cache. They must come from the same encoder.
+        """
+        with np.load(path) as data:
+            self._emb_cache.update(zip(data["keys"].tolist(), data["embeddings"]))
 
     def sim(self, r1: str, r2: str) -> float:
         """
@@ -27,10 +226,9 @@ class Similarity:
         sim.sim("birth place", "place of birth"): return: 0.92
         """
 
-        embeddings = self.encoder.encode([r1, r2], convert_to_tensor=True, normalize_embeddings=True)
-        sim = F.cosine_similarity(
-            embeddings[0].unsqueeze(0), embeddings[1].unsqueeze(0))
-        return sim.item()
+        # embeddings are normalized, so cosine similarity is a plain dot product
+        embeddings = self._encode([r1, r2])
+        return float(np.dot(embeddings[0], embeddings[1]))
 
     def batch_sim(self, query: str, top_k: int = 5, candidates: list = []) -> list[Tuple[str, float]]:
         """
@@ -55,11 +253,106 @@ class Similarity:
         if not candidates:
             raise ValueError("Candidates list cannot be empty.")
 
-        kg_embeds = self.encoder.encode(candidates, normalize_embeddings=True)
-        query_embed = self.encoder.encode([query], normalize_embeddings=True)
-        scores = query_embed @ kg_embeds.T
-        top_k_indices = torch.topk(torch.tensor(scores), top_k).indices.tolist()[0]
-        return [(candidates[i], scores[0][i].item()) for i in top_k_indices]
+        # candidates (typically the KG relation vocabulary) and the query are cached,
+        # so only strings never seen before are encoded
+        kg_embeds = self._candidate_matrix(candidates)
+        self._embed_many([query])
+        query_embed = self._emb_cache[query]
+        top_k = min(top_k, len(candidates))
+        if top_k <= 0:
+            return []
+
+        device = self.encoder.device
+        if device.type == "cuda":
+            # the candidate matrix stays on the GPU between calls: product and top-k run there
+            with torch.inference_mode():
+                if self._cand_tensor is None:
+                    self._cand_tensor = torch.from_numpy(kg_embeds).to(device)
+                q = torch.from_numpy(query_embed).to(device)
+                if self._cand_tensor.dtype == torch.int8:
+                    block = self.QUANTIZED_BLOCK_ROWS
+                    scores = torch.empty(len(candidates), dtype=torch.float32, device=device)
+                    for i in range(0, len(candidates), block):
+                        scores[i:i + block] = self._cand_tensor[i:i + block].float() @ q
+                    scores /= 127.0
+                else:
+                    scores = self._cand_tensor @ q
+                values, indices = scores.topk(top_k)
+            return [(candidates[i], v) for i, v in zip(indices.tolist(), values.tolist())]
+
+        if kg_embeds.dtype == np.int8:
+            # upcast in row blocks: a full FP32 copy would cost more than the unquantized matrix
+            block = self.QUANTIZED_BLOCK_ROWS
+            scores = np.empty(len(candidates), dtype=np.float32)
+            for i in range(0, len(candidates), block):
+                scores[i:i + block] = kg_embeds[i:i + block].astype(np.float32) @ query_embed
+            scores /= 127.0
+        else:
+            scores = kg_embeds @ query_embed
+        # partial selection (O(n)) of the top-k, then sort only those k
+        top_k_indices = np.argpartition(scores, -top_k)[-top_k:]
+        top_k_indices = top_k_indices[np.argsort(scores[top_k_indices])[::-1]]
+        return [(candidates[i], float(scores[i])) for i in top_k_indices]
+
+    def _relation_matrix(self, relations: Iterable[str]) -> Tuple[np.ndarray, Dict[str, int]]:
+        """
+        Stack the normalized embeddings of `relations` (encoding missing ones in one batch)
+        into a (n_relations, dim) matrix, with a relation -> row index mapping.
+        """
+        relations = list(dict.fromkeys(relations))
+        self._embed_many(relations)
+        idx = {r: i for i, r in enumerate(relations)}
+        M = np.stack([self._emb_cache[r] for r in relations]) if relations else np.zeros((0, 0), dtype=np.float32)
+        return M, idx
+
+    def _uses_embeddings(self, sim_func: Optional[Callable[[str, str], float]]) -> bool:
+        # None and `self.sim` both mean embedding cosine similarity, computed from the cache
+        return sim_func is None or sim_func == self.sim
+
+    @staticmethod
+    def _memoize(sim_func: Callable[[str, str], float]) -> Callable[[str, str], float]:
+        return sim_func if hasattr(sim_func, "cache_info") else lru_cache(maxsize=None)(sim_func)
+
+    def _score_candidates(
+        self,
+        candidates: List[str],
+        matched: Dict[str, List[Tuple[str, str]]],
+        M: np.ndarray,
+        idx: Dict[str, int],
+        normalize: bool,
+    ) -> np.ndarray:
+        """
+        `score` of every candidate at once for the embedding path: each candidate takes its
+        group of (pseudo relation, KG relation) pairs from `matched`; all similarities
+        come from a (pseudo relation x relation) similarity table (one matrix product) and
+        are summed per candidate.
+        """
+        cand_ids, rel_rows, pseudo_rows = [], [], []
+        for ci, c in enumerate(candidates):
+            for r_ui, r in matched.get(c, ()):
+                cand_ids.append(ci)
+                rel_rows.append(idx[r])
+                pseudo_rows.append(idx[r_ui])
+
+        n = len(candidates)
+        if not cand_ids:
+            return np.zeros(n, dtype=np.float64)
+        # similarity of each distinct pseudo relation to every relation in a single GEMM,
+        # instead of copying two (n_edges, dim) row blocks for a row-wise dot product
+        pseudo_u, pseudo_ids = np.unique(pseudo_rows, return_inverse=True)
+        S = M[pseudo_u] @ M.T
+        kernel = _get_aggregate_kernel()
+        if kernel is not None:
+            sums = np.zeros(n, dtype=np.float64)
+            counts = np.zeros(n, dtype=np.int64)
+            kernel(np.asarray(cand_ids, dtype=np.int64), pseudo_ids.astype(np.int64),
+                   np.asarray(rel_rows, dtype=np.int64), S, sums, counts)
+        else:
+            sums = np.bincount(cand_ids, weights=S[pseudo_ids, rel_rows], minlength=n)
+            counts = np.bincount(cand_ids, minlength=n)
+        if normalize:
+            sums /= np.maximum(counts, 1)
+        return sums
 
     def score(
         self,
@@ -67,8 +360,9 @@ class Similarity:
         explicit_entities: List[str],
         pseudo_relations: List[str],
         KG: Dict[str, List[Tuple[str, str]]],
-        sim_func: Callable[[str, str], float],
-        normalize: bool = True
+        sim_func: Optional[Callable[[str, str], float]] = None,
+        normalize: bool = True,
+        index: Optional[KGIndex] = None
     ) -> float:
         """
         Compute the semantic matching score of a candidate entity `candidate_entity`
@@ -89,10 +383,16 @@ class Similarity:
         KG : Dict[str, List[Tuple[str, str]]]
             The knowledge graph, represented as a dictionary:
             { head_entity: [(relation, tail_entity), ...], ... }.
-        sim_func : Callable[[str, str], float]
+        sim_func : Callable[[str, str], float], optional
             Function computing similarity between two relation strings (e.g., embedding cosine similarity).
+            If None or `self.sim`, cosine similarity is computed from cached embeddings, all missing
+            relations being encoded in one batch; other functions are memoized per relation pair.
         normalize : bool, optional
             Whether to normalize the final score by number of relations, default=True.
+        index : KGIndex, optional
+            Index of `KG` from `build_index`, to look up the candidate's edges instead of scanning
+            every edge of the explicit entities. Worth it when scoring many candidates on the same KG;
+            the caller must rebuild it after editing the KG.
 
         Returns
         -------
@@ -100,19 +400,91 @@ class Similarity:
             The cumulative similarity score representing how well the candidate matches
             the pseudo-relations and connects to the explicit entities.
         """
-        total_score = 0.0
-        match_count = 0
+        pairs = self._matched_pairs(candidate_entity, explicit_entities, pseudo_relations, KG, index)
+        if not pairs:
+            # the candidate is not linked to any explicit entity
+            return 0.0
+        if self._uses_embeddings(sim_func):
+            # only the relations actually compared are encoded
+            self._embed_many(r for pair in pairs for r in pair)
+            return self._score_pairs(pairs, self._cached_sim, normalize)
+        return self._score_pairs(pairs, self._memoize(sim_func), normalize)
+
+    def _cached_sim(self, r1: str, r2: str) -> float:
+        # `sim` of two relations already in the embedding cache
+        return float(np.dot(self._emb_cache[r1], self._emb_cache[r2]))
+
+    @staticmethod
+    def build_index(KG: Dict[str, List[Tuple[str, str]]]) -> KGIndex:
+        """
+        Build the `KGIndex` of `KG`, to pass as `index` to `score`/`rank_candidates`.
+        The index does not follow later edits of `KG`: build a new one after changing it.
+
+        Example:
+        index = sim.build_index(KG)
+        sim.rank_candidates(candidate_sets, explicit_entities, pseudo_relations, KG, index=index)
+        """
+        return KGIndex(KG)
 
+    @staticmethod
+    def _matched_pairs(
+        candidate_entity: str,
+        explicit_entities: List[str],
+        pseudo_relations: List[str],
+        KG: Dict[str, List[Tuple[str, str]]],
+        index: Optional[KGIndex] = None,
+    ) -> List[Tuple[str, str]]:
+        # (pseudo relation, KG relation) pairs compared by `score`, in order
+        if index is not None:
+            # only the explicit entities reaching the candidate are visited
+            heads = index.heads_by_tail.get(candidate_entity)
+            if not heads:
+                return []
+            return [
+                (r_ui, r)
+                for e_ui, r_ui in zip(explicit_entities, pseudo_relations) if e_ui in heads
+                for r in index.pairs[(e_ui, candidate_entity)]
+            ]
+        # without an index, only the edges of the explicit entities are scanned
+        return [
+            (r_ui, r)
+            for e_ui, r_ui in zip(explicit_entities, pseudo_relations)
+            for r, tail in KG.get(e_ui, ()) if tail == candidate_entity
+        ]
+
+    @staticmethod
+    def _edges_by_tail(
+        explicit_entities: List[str],
+        pseudo_relations: List[str],
+        KG: Dict[str, List[Tuple[str, str]]],
+    ) -> Dict[str, List[Tuple[str, str]]]:
+        """
+        `_matched_pairs` of every tail at once: the edges of the explicit entities are grouped
+        by tail in one pass, so scoring many candidates does not rescan them per candidate.
+        Built per call from `KG`, so edits to the KG are always taken into account.
+        """
+        edges_by_tail: Dict[str, List[Tuple[str, str]]] = {}
         for e_ui, r_ui in zip(explicit_entities, pseudo_relations):
-            kg_edges = KG.get(e_ui, [])
-            for r, tail in kg_edges:
-                if tail == candidate_entity:
-                    sim_val = sim_func(r_ui, r)
-                    total_score += sim_val
-                    match_count += 1
+            for r, tail in KG.get(e_ui, ()):
+                pairs = edges_by_tail.get(tail)
+                if pairs is None:
+                    pairs = edges_by_tail[tail] = []
+                pairs.append((r_ui, r))
+        return edges_by_tail
+
+    @staticmethod
+    def _score_pairs(
+        pairs: List[Tuple[str, str]],
+        sim_func: Callable[[str, str], float],
+        normalize: bool,
+    ) -> float:
+        # `score` from the matched (pseudo relation, KG relation) pairs
+        total_score = 0.0
+        for r_ui, r in pairs:
+            total_score += sim_func(r_ui, r)
 
-        if normalize and match_count > 0:
-            total_score /= match_count
+        if normalize and pairs:
+            total_score /= len(pairs)
 
         return total_score
 
@@ -122,10 +494,11 @@ class Similarity:
         explicit_entities: List[str],
         pseudo_relations: List[str],
         KG: Dict[str, List[Tuple[str, str]]],
-        sim_func: Callable[[str, str], float],
+        sim_func: Optional[Callable[[str, str], float]] = None,
         k1: int = 3,
         normalize: bool = True,
-        aggregate: str = "max"
+        aggregate: str = "max",
+        index: Optional[KGIndex] = None
     ) -> List[Tuple[str, float]]:
         """
         Rank candidate entities based on their relevance to the unknown entity group
@@ -142,8 +515,8 @@ class Similarity:
             Relations corresponding to each explicit entity.
         KG : Dict[str, List[Tuple[str, str]]]
             The knowledge graph data structure.
-        sim_func : Callable[[str, str], float]
-            Function measuring similarity between two relations.
+        sim_func : Callable[[str, str], float], optional
+            Function measuring similarity between two relations (see `score`).
         k1 : int, optional
             Number of top candidates to select (default=3).
         normalize : bool, optional
@@ -154,36 +527,59 @@ class Similarity:
             - "max"  : keep the maximum score per entity
             - "mean" : average over occurrences
             - "sum"  : sum over occurrences
+        index : KGIndex, optional
+            Index of `KG` from `build_index` (see `score`).
 
         Returns
         -------
         List[Tuple[str, float]]
             A list of tuples (candidate_entity, score), sorted descending by score.
         """
-        scored = {}
+        if aggregate not in ("max", "mean", "sum"):
+            raise ValueError(f"Unknown aggregate mode: {aggregate}")
 
-        # Evaluate all candidates from each set
-        for candidates in candidate_sets:
-            for c in candidates:
-                s = self.score(c, explicit_entities, pseudo_relations, KG, sim_func, normalize)
-                if c not in scored:
-                    scored[c] = [s]
-                else:
-                    scored[c].append(s)
-
-        # Aggregate scores from multiple occurrences
-        aggregated_scores = {}
-        for c, vals in scored.items():
-            if aggregate == "max":
-                aggregated_scores[c] = max(vals)
-            elif aggregate == "mean":
-                aggregated_scores[c] = sum(vals) / len(vals)
-            elif aggregate == "sum":
-                aggregated_scores[c] = sum(vals)
+        # matched (pseudo relation, KG relation) pairs of every distinct candidate
+        unique = list(dict.fromkeys(c for candidates in candidate_sets for c in candidates))
+        if index is not None:
+            matched = {c: self._matched_pairs(c, explicit_entities, pseudo_relations, KG, index) for c in unique}
+        else:
+            edges_by_tail = self._edges_by_tail(explicit_entities, pseudo_relations, KG)
+            matched = {c: edges_by_tail.get(c, []) for c in unique}
+
+        if self._uses_embeddings(sim_func):
+            # encode every compared relation once and score all candidates in one vectorized pass
+            M, idx = self._relation_matrix(r for pairs in matched.values() for pair in pairs for r in pair)
+            cand_scores = dict(zip(unique, self._score_candidates(unique, matched, M, idx, normalize).tolist()))
+        else:
+            sim_func = self._memoize(sim_func)
+            cand_scores = {c: self._score_pairs(matched[c], sim_func, normalize) for c in unique}
+        score_fn = cand_scores.__getitem__
+
+        # Evaluate all candidates from each set, aggregating on the fly
+        if aggregate == "max":
+            best = {}
+            for candidates in candidate_sets:
+                for c in candidates:
+                    s = score_fn(c)
+                    if c not in best or s > best[c]:
+                        best[c] = s
+        else:
+            # (sum, n) per entity
+            acc = {}
+            for candidates in candidate_sets:
+                for c in candidates:
+                    s = score_fn(c)
+                    if c in acc:
+                        total, n = acc[c]
+                        acc[c] = (total + s, n + 1)
+                    else:
+                        acc[c] = (s, 1)
+            if aggregate == "mean":
+                best = {c: total / n for c, (total, n) in acc.items()}
             else:
-                raise ValueError(f"Unknown aggregate mode: {aggregate}")
+                best = {c: total for c, (total, _) in acc.items()}
 
         # Select top-k1 highest scoring candidates
-        topk = nlargest(k1, aggregated_scores.items(), key=lambda x: x[1])
+        topk = nlargest(k1, best.items(), key=itemgetter(1))
 
         return topk